@@ -3,7 +3,16 @@ OAuth 2.0 authentication for YouTube API
 """
 
 import os
+from datetime import datetime, timedelta
 from pathlib import Path
+
+try:
+    import fcntl  # POSIX advisory locking for the token file
+except ImportError:
+    fcntl = None
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -11,6 +20,11 @@ from googleapiclient.discovery import build
 
 from .config import SCOPES, CREDENTIALS_FILE, TOKEN_FILE, API_SERVICE_NAME, API_VERSION
 
+# One keep-alive HTTP client shared by every service built in this process,
+# so repeat API calls reuse the TCP/TLS connection instead of paying a new
+# handshake each time.
+_pooled_http = httplib2.Http()
+
 
 class YouTubeAuthenticator:
     """Handles OAuth 2.0 authentication for YouTube API"""
@@ -37,10 +51,10 @@ class YouTubeAuthenticator:
 
         # If there are no valid credentials, request authorization
         if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
+            if creds and creds.refresh_token and self._near_expiry(creds):
                 print("Refreshing expired credentials...")
                 try:
-                    creds.refresh(Request())
+                    creds = self._refresh_credentials(creds)
                 except Exception as e:
                     print(f"Failed to refresh token: {e}")
                     creds = None
@@ -65,20 +79,58 @@ class YouTubeAuthenticator:
 
             # Save the credentials for the next run
             try:
-                with open(self.token_file, 'w') as token:
-                    token.write(creds.to_json())
+                self._save_token(creds)
                 print(f"✅ Credentials saved to {self.token_file}")
             except Exception as e:
                 print(f"Warning: Could not save token: {e}")
 
-        # Build the service
+        # Build the service on the shared pooled HTTP client
         try:
-            self._service = build(API_SERVICE_NAME, API_VERSION, credentials=creds)
+            self._service = build(API_SERVICE_NAME, API_VERSION,
+                                  http=AuthorizedHttp(creds, http=_pooled_http))
             return True
         except Exception as e:
             print(f"❌ Failed to build YouTube service: {e}")
             return False
 
+    @staticmethod
+    def _near_expiry(creds) -> bool:
+        """True once the access token is within a minute of expiring"""
+        if creds.expiry is None:
+            return creds.expired
+        return creds.expiry - timedelta(seconds=60) <= datetime.utcnow()
+
+    def _refresh_credentials(self, creds):
+        """
+        Refresh the access token under an exclusive file lock
+
+        Concurrent invocations of the tool share one refresh: whoever gets
+        the lock first hits Google's token endpoint, everyone else re-reads
+        the freshly written token file instead of stampeding the refresh.
+        """
+        lock_file = self.token_file.with_suffix(self.token_file.suffix + '.lock')
+        with open(lock_file, 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another process may have refreshed while we waited
+                if self.token_file.exists():
+                    latest = Credentials.from_authorized_user_file(str(self.token_file), SCOPES)
+                    if latest.valid and not self._near_expiry(latest):
+                        return latest
+                creds.refresh(Request())
+                self._save_token(creds)
+                return creds
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _save_token(self, creds):
+        """Persist credentials atomically so a crash can't truncate the token file"""
+        tmp_file = self.token_file.with_suffix(self.token_file.suffix + '.tmp')
+        tmp_file.write_text(creds.to_json())
+        os.replace(tmp_file, self.token_file)
+
     @property
     def service(self):
         """Get the authenticated YouTube service object"""
@@ -91,12 +143,26 @@ class YouTubeAuthenticator:
         return self._service is not None
 
 
+# Authenticated services cached per (credentials, token) file pair so repeat
+# get_youtube_service() calls share one client instead of re-running auth.
+_service_cache = {}
+
+
 def get_youtube_service():
     """
     Convenience function to get an authenticated YouTube service
     Returns None if authentication fails
+
+    Successful services are cached for the lifetime of the process, so
+    calling this repeatedly costs one dict lookup after the first time.
     """
+    key = (CREDENTIALS_FILE, TOKEN_FILE)
+    service = _service_cache.get(key)
+    if service is not None:
+        return service
+
     auth = YouTubeAuthenticator()
     if auth.authenticate():
+        _service_cache[key] = auth.service
         return auth.service
     return None
\ No newline at end of file
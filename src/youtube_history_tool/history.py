@@ -2,49 +2,123 @@
 YouTube watch history retrieval and management
 """
 
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
 import json
 
+try:
+    import orjson  # Optional C encoder, much faster on large exports
+except ImportError:
+    orjson = None
+
 from .config import DEFAULT_MAX_RESULTS
 
+# Activity types that might represent watched videos
+_ALLOWED_ACTIVITY_TYPES = frozenset({'upload', 'playlistItem', 'recommendation'})
+
+
+def _parse_iso_z(timestamp_str: str) -> datetime:
+    """
+    Fast path for YouTube's fixed 'YYYY-MM-DDTHH:MM:SS(.sss)Z' timestamps
+
+    Reads the digits at fixed offsets instead of running the general-purpose
+    ISO 8601 parser, avoiding the intermediate string from replacing 'Z'.
+    Raises ValueError if the string doesn't match the expected shape.
+    """
+    if len(timestamp_str) not in (20, 24) or timestamp_str[-1] != 'Z':
+        raise ValueError(f"not a YouTube ISO 8601 timestamp: {timestamp_str!r}")
+    microsecond = int(timestamp_str[20:23]) * 1000 if len(timestamp_str) == 24 else 0
+    return datetime(
+        int(timestamp_str[0:4]), int(timestamp_str[5:7]), int(timestamp_str[8:10]),
+        int(timestamp_str[11:13]), int(timestamp_str[14:16]), int(timestamp_str[17:19]),
+        microsecond, tzinfo=timezone.utc
+    )
+
+
+def _ms_to_datetime(timestamp_ms: int) -> datetime:
+    """Reify a unix-millisecond timestamp into a tz-aware datetime"""
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+
 
 class WatchHistoryItem:
     """Represents a single item from YouTube watch history"""
 
-    def __init__(self, data: Dict):
-        self.raw_data = data
+    __slots__ = ('title', 'published_at', 'channel_title', 'description',
+                 'activity_type', 'video_id', 'timestamp',
+                 '_search_blob', '_description_truncated', '_display')
 
-        # Parse the activity data
-        snippet = data.get('snippet', {})
-        content_details = data.get('contentDetails', {})
-
-        self.title = snippet.get('title', 'Unknown Title')
-        self.published_at = snippet.get('publishedAt', '')
-        self.channel_title = snippet.get('channelTitle', 'Unknown Channel')
-        self.description = snippet.get('description', '')
-        self.activity_type = snippet.get('type', '')
+    def __init__(self, data: Dict):
+        # Parse the activity data; bind snippet.get to a local once so bulk
+        # construction doesn't repeat the attribute lookup per field
+        snippet = data.get('snippet') or {}
+        content_details = data.get('contentDetails') or {}
+        get = snippet.get
+
+        self.title = get('title', 'Unknown Title')
+        self.published_at = get('publishedAt', '')
+        self.channel_title = get('channelTitle', 'Unknown Channel')
+        self.description = get('description', '')
+        self.activity_type = get('type', '')
+
+        # Export truncation is fixed at 200 chars, so compute it once here
+        # instead of re-slicing on every to_dict call
+        description = self.description
+        self._description_truncated = (
+            description if len(description) <= 200 else description[:200] + '...'
+        )
 
         # Try to get video ID from different possible locations
-        self.video_id = None
-        if 'upload' in content_details:
-            self.video_id = content_details['upload'].get('videoId')
-        elif 'playlistItem' in content_details:
-            resource_id = content_details['playlistItem'].get('resourceId', {})
-            self.video_id = resource_id.get('videoId')
-
-        self.video_url = f"https://www.youtube.com/watch?v={self.video_id}" if self.video_id else None
+        self.video_id = self._extract_video_id(content_details)
 
         # Parse timestamp
         self.timestamp = self._parse_timestamp(self.published_at)
 
-    def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
-        """Parse YouTube timestamp to datetime object"""
+        # Searchable fields lowercased once, so repeated searches are pure
+        # C-level substring tests against cached bytes
+        self._search_blob = (
+            (self.title + '\0' + self.channel_title + '\0' + self.description)
+            .lower().encode('utf-8')
+        )
+
+        # Display line precomputed once; __str__ runs per match when listing
+        # search results
+        timestamp_str = (_ms_to_datetime(self.timestamp).strftime('%Y-%m-%d %H:%M')
+                         if self.timestamp else 'Unknown date')
+        self._display = f"[{timestamp_str}] {self.title} - {self.channel_title}"
+
+    @property
+    def video_url(self) -> Optional[str]:
+        """Watch URL, built on demand so items that never print it don't allocate it"""
+        return f"https://www.youtube.com/watch?v={self.video_id}" if self.video_id else None
+
+    @staticmethod
+    def _extract_video_id(content_details: Dict) -> Optional[str]:
+        """Pull the video ID out of whichever contentDetails shape carries it"""
+        return (
+            (content_details.get('upload') or {}).get('videoId')
+            or ((content_details.get('playlistItem') or {}).get('resourceId') or {}).get('videoId')
+        )
+
+    def _parse_timestamp(self, timestamp_str: str) -> Optional[int]:
+        """
+        Parse YouTube timestamp to unix milliseconds
+
+        Stored as an int rather than a datetime: comparisons and min/max on
+        the summary path become C-level integer ops, and each item saves the
+        datetime object's memory. Reify with _ms_to_datetime when printing.
+        """
         if not timestamp_str:
             return None
         try:
-            # YouTube uses ISO 8601 format
-            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+            # YouTube uses ISO 8601 format with a trailing 'Z'
+            return int(_parse_iso_z(timestamp_str).timestamp() * 1000)
+        except ValueError:
+            pass
+        try:
+            # Fall back to the general parser for anything unusual
+            dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+            return int(dt.timestamp() * 1000)
         except (ValueError, AttributeError):
             return None
 
@@ -56,14 +130,13 @@ class WatchHistoryItem:
             'video_id': self.video_id,
             'video_url': self.video_url,
             'published_at': self.published_at,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'timestamp': _ms_to_datetime(self.timestamp).isoformat() if self.timestamp else None,
             'activity_type': self.activity_type,
-            'description': self.description[:200] + '...' if len(self.description) > 200 else self.description
+            'description': self._description_truncated
         }
 
     def __str__(self) -> str:
-        timestamp_str = self.timestamp.strftime('%Y-%m-%d %H:%M') if self.timestamp else 'Unknown date'
-        return f"[{timestamp_str}] {self.title} - {self.channel_title}"
+        return self._display
 
     def __repr__(self) -> str:
         return f"WatchHistoryItem(title='{self.title}', channel='{self.channel_title}')"
@@ -86,31 +159,39 @@ class HistoryRetriever:
         try:
             print(f"📡 Fetching up to {max_results} items from YouTube API...")
 
-            # Get activities (this includes various user activities, not just watch history)
-            request = self.youtube.activities().list(
-                part='snippet,contentDetails',
-                mine=True,
-                maxResults=min(max_results, 50)  # API limit is 50 per request
-            )
-
-            response = request.execute()
-            items = response.get('items', [])
+            # Get activities (this includes various user activities, not just
+            # watch history), following nextPageToken past the 50-item page cap
+            items = []
+            page_token = None
+            while len(items) < max_results:
+                request = self.youtube.activities().list(
+                    part='snippet,contentDetails',
+                    mine=True,
+                    maxResults=min(max_results - len(items), 50),  # API limit is 50 per request
+                    pageToken=page_token
+                )
+                response = request.execute()
+                items.extend(response.get('items', []))
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
 
             print(f"📥 Retrieved {len(items)} activity items from API")
 
-            # Filter and convert to WatchHistoryItem objects
+            # Filter and convert to WatchHistoryItem objects, rejecting items
+            # on the raw dicts before paying any construction cost
             history_items = []
             for item in items:
-                # We're interested in uploads and playlist items that might represent watched videos
-                activity_type = item['snippet'].get('type', '')
-                if activity_type in ['upload', 'playlistItem', 'recommendation']:
-                    try:
-                        history_item = WatchHistoryItem(item)
-                        if history_item.video_id:  # Only include items with valid video IDs
-                            history_items.append(history_item)
-                    except Exception as e:
-                        print(f"⚠️  Warning: Could not parse activity item: {e}")
-                        continue
+                activity_type = item.get('snippet', {}).get('type', '')
+                if activity_type not in _ALLOWED_ACTIVITY_TYPES:
+                    continue
+                if not WatchHistoryItem._extract_video_id(item.get('contentDetails', {})):
+                    continue
+                try:
+                    history_items.append(WatchHistoryItem(item))
+                except Exception as e:
+                    print(f"⚠️  Warning: Could not parse activity item: {e}")
+                    continue
 
             print(f"✅ Processed {len(history_items)} valid history items")
 
@@ -137,24 +218,19 @@ class HistoryRetriever:
             print("⚠️  No history data to search. Try retrieving history first.")
             return []
 
-        query_lower = query.lower()
-        matching_items = []
-
-        for item in history:
-            # Search in title, channel name, and description
-            if (query_lower in item.title.lower() or
-                    query_lower in item.channel_title.lower() or
-                    query_lower in item.description.lower()):
-                matching_items.append(item)
-
-        return matching_items
+        needle = query.lower().encode('utf-8')
+        return [item for item in history if needle in item._search_blob]
 
     def export_to_json(self, history: List[WatchHistoryItem], filename: str = "watch_history.json"):
         """Export history to JSON file"""
         try:
             data = [item.to_dict() for item in history]
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             print(f"💾 Exported {len(history)} items to {filename}")
         except Exception as e:
             print(f"❌ Error exporting to JSON: {e}")
@@ -165,27 +241,29 @@ class HistoryRetriever:
             print("📊 No history items to summarize")
             return
 
-        print(f"\n📊 Watch History Summary")
-        print(f"{'=' * 50}")
-        print(f"Total items: {len(history)}")
+        # Build the summary in memory and emit it as one write
+        lines = [
+            "\n📊 Watch History Summary",
+            "=" * 50,
+            f"Total items: {len(history)}",
+        ]
 
         # Count by channel
-        channels = {}
-        for item in history:
-            channels[item.channel_title] = channels.get(item.channel_title, 0) + 1
-
-        print(f"Unique channels: {len(channels)}")
+        channels = Counter(item.channel_title for item in history)
+        lines.append(f"Unique channels: {len(channels)}")
 
         # Show top channels
         if channels:
-            print(f"\nTop channels:")
-            sorted_channels = sorted(channels.items(), key=lambda x: x[1], reverse=True)
-            for channel, count in sorted_channels[:5]:
-                print(f"  {channel}: {count} videos")
-
-        # Show date range
-        timestamps = [item.timestamp for item in history if item.timestamp]
-        if timestamps:
-            oldest = min(timestamps)
-            newest = max(timestamps)
-            print(f"\nDate range: {oldest.strftime('%Y-%m-%d')} to {newest.strftime('%Y-%m-%d')}")
+            lines.append("\nTop channels:")
+            lines.extend(f"  {channel}: {count} videos"
+                         for channel, count in channels.most_common(5))
+
+        # Show date range (timestamps are unix-ms ints, so min/max compare
+        # plain integers)
+        oldest = min((item.timestamp for item in history if item.timestamp), default=None)
+        newest = max((item.timestamp for item in history if item.timestamp), default=None)
+        if oldest and newest:
+            lines.append(f"\nDate range: {_ms_to_datetime(oldest).strftime('%Y-%m-%d')} "
+                         f"to {_ms_to_datetime(newest).strftime('%Y-%m-%d')}")
+
+        print('\n'.join(lines))
@@ -5,8 +5,14 @@ YouTube Watch History Tool
 A simple script to search through your YouTube watch history.
 """
 
+import functools
 import sys
 from pathlib import Path
+
+try:
+    import readline  # noqa: F401  Gives input() line editing and history
+except ImportError:
+    pass
 from .config import SCOPES, DEFAULT_MAX_RESULTS
 from .auth import YouTubeAuthenticator
 from .history import HistoryRetriever
@@ -71,11 +77,10 @@ def run_takeout_mode(file_path: Path):
     # Show summary
     processor.print_summary(history)
 
-    # Show recent items
+    # Show recent items in one write
     print(f"\n🎥 Recent videos (showing up to 15 items):")
     print("-" * 80)
-    for item in history[:15]:
-        print(f"  {item}")
+    print('\n'.join(f"  {item}" for item in history[:15]))
 
     # Interactive search
     run_interactive_search(history, processor.search_history)
@@ -140,11 +145,10 @@ def run_api_mode():
     # Show summary
     retriever.print_summary(history)
 
-    # Show recent items
+    # Show recent items in one write
     print(f"\n🎥 Recent activity (showing up to 10 items):")
     print("-" * 60)
-    for item in history[:10]:
-        print(f"  {item}")
+    print('\n'.join(f"  {item}" for item in history[:10]))
 
     # Interactive search
     run_interactive_search(history, retriever.search_history)
@@ -160,6 +164,12 @@ def run_interactive_search(history, search_function):
     print(f"\n🔍 Search functionality:")
     print("Type a search term to find videos, or 'quit' to exit")
 
+    @functools.lru_cache(maxsize=128)
+    def cached_search(query):
+        # Repeated queries come straight from the cache; results are stored
+        # as a tuple so they're hashable
+        return tuple(search_function(query, history))
+
     while True:
         try:
             query = input("\nSearch> ").strip()
@@ -168,13 +178,15 @@ def run_interactive_search(history, search_function):
             if not query:
                 continue
 
-            results = search_function(query, history)
+            results = cached_search(query)
             if results:
-                print(f"\n📋 Found {len(results)} matching videos:")
-                for i, item in enumerate(results[:15], 1):
-                    print(f"  {i:2d}. {item}")
+                # Batch the result listing into a single stdout write
+                lines = [f"\n📋 Found {len(results)} matching videos:"]
+                lines.extend(f"  {i:2d}. {item}"
+                             for i, item in enumerate(results[:15], 1))
                 if len(results) > 15:
-                    print(f"  ... and {len(results) - 15} more")
+                    lines.append(f"  ... and {len(results) - 15} more")
+                print('\n'.join(lines))
             else:
                 print(f"❌ No videos found matching '{query}'")
 
@@ -2,22 +2,170 @@
 Google Takeout data processing for YouTube watch history
 """
 
+import functools
+import gzip
 import json
+import logging
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+
+try:
+    import ijson  # Optional streaming parser for large Takeout files
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional C parser/encoder, much faster than stdlib json
+except ImportError:
+    orjson = None
 from pathlib import Path
 from typing import List, Dict, Optional, Union
-from urllib.parse import parse_qs, urlparse
 
 from .history import WatchHistoryItem
 
+logger = logging.getLogger(__name__)
+
+# Patterns compiled once at import; _extract_video_id and _parse_timestamp
+# run per entry, so per-call re.compile dispatch adds up on large histories.
+# All supported URL forms converge on the same 11-char ID, so one
+# alternation scans the URL once instead of three passes.
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/)'
+    r'([a-zA-Z0-9_-]{11})'
+)
+_TZ_STRIP_RE = re.compile(r'\s+[A-Z]{3,4}$')
+_DATE_FALLBACK_RE = re.compile(r'(\w{3}\s+\d{1,2},\s+\d{4})')
+
+_MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+           'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+
+# Channel names repeat across most of a history (a 1M-item export may hold
+# only a few thousand unique channels), so map each name to one shared str
+# instead of keeping a per-item copy of the JSON-parsed string
+_CHANNEL_INTERN: Dict[str, str] = {}
+
+
+def _timestamp_sort_key(dt: datetime) -> int:
+    """Collapse a datetime into one plain int that orders the same way"""
+    return (((dt.year * 12 + dt.month) * 32 + dt.day) * 86400
+            + dt.hour * 3600 + dt.minute * 60 + dt.second)
+
+
+def _parse_takeout_fast(clean_time: str) -> Optional[datetime]:
+    """
+    Hand-rolled parser for the dominant 'Dec 15, 2023, 3:45:23 PM' shape
+
+    Splits the fields and converts them with int() and a month table,
+    bypassing the strptime format interpreter entirely; returns None on any
+    mismatch so the caller falls back to the general trial loop.
+    """
+    if not (clean_time.endswith(' AM') or clean_time.endswith(' PM')):
+        return None
+    month = _MONTHS.get(clean_time[:3])
+    if month is None:
+        return None
+    try:
+        day_s, year_s, hms = clean_time[4:-3].split(', ')
+        hour_s, minute_s, second_s = hms.split(':')
+        hour = int(hour_s) % 12
+        if clean_time[-2] == 'P':
+            hour += 12
+        return datetime(int(year_s), month, int(day_s),
+                        hour, int(minute_s), int(second_s))
+    except ValueError:
+        return None
+
+@functools.lru_cache(maxsize=131072)
+def _parse_timestamp_cached(timestamp_str: str) -> Optional[datetime]:
+    """
+    Parse a Google Takeout timestamp string
+
+    Cached because second-resolution strings repeat heavily in real exports
+    (batch-watching sessions); repeat strings become a dict lookup instead
+    of a strptime trial loop, and datetimes are immutable so sharing one
+    object across items is safe.
+    """
+    try:
+        # Google Takeout format: "Dec 15, 2023, 3:45:23 PM PST"
+        # Remove timezone info for basic parsing
+        clean_time = _TZ_STRIP_RE.sub('', timestamp_str)
+
+        # Dominant format gets the hand-rolled fast path
+        parsed = _parse_takeout_fast(clean_time)
+        if parsed is not None:
+            return parsed
+
+        # Dispatch on the string's shape to pick the one matching format
+        # instead of trialling every format until one parses
+        if len(clean_time) >= 10 and clean_time[4] == '-' and clean_time[7] == '-':
+            fmt = "%Y-%m-%dT%H:%M:%S" if 'T' in clean_time else "%Y-%m-%d %H:%M:%S"
+        elif clean_time.endswith('M'):  # trailing AM/PM
+            fmt = "%b %d, %Y, %I:%M:%S %p"  # Dec 15, 2023, 3:45:23 PM
+        else:
+            fmt = "%b %d, %Y, %H:%M:%S"  # Dec 15, 2023, 15:45:23
+        try:
+            return datetime.strptime(clean_time, fmt)
+        except ValueError:
+            pass
+
+        # If all else fails, try parsing just the date
+        date_match = _DATE_FALLBACK_RE.search(timestamp_str)
+        if date_match:
+            return datetime.strptime(date_match.group(1), "%b %d, %Y")
+
+    except Exception as e:
+        logger.warning("Could not parse timestamp %r: %s", timestamp_str, e)
+
+    return None
+
+
+# Entries per chunk handed to a parser worker; histories smaller than one
+# chunk are parsed in-process since pool startup would outweigh the win
+_PARSE_CHUNK_SIZE = 10_000
+
+
+def _parse_entry_chunk(entries: List[Dict]) -> tuple:
+    """
+    Construct TakeoutWatchHistoryItems for one chunk of raw entries
+
+    Module-level so ProcessPoolExecutor workers can pickle it; returns the
+    valid items plus the number of entries that were rejected.
+    """
+    items = []
+    skipped = 0
+    for entry in entries:
+        # Validate field shapes up front so the common path never enters the
+        # exception machinery; lazy %-formatting keeps rejected entries from
+        # paying string building unless warnings are actually emitted
+        if (not isinstance(entry.get('title'), str)
+                or not isinstance(entry.get('titleUrl'), str)
+                or not isinstance(entry.get('subtitles', []), list)
+                or not isinstance(entry.get('time', ''), str)):
+            logger.warning("Skipping malformed Takeout entry: %.120r", entry)
+            skipped += 1
+            continue
+
+        # Extract the ID first so entries without one skip construction
+        # entirely, and valid ones don't re-run the extraction
+        video_id = TakeoutWatchHistoryItem._extract_video_id(entry['titleUrl'])
+        if not video_id:  # Only include items with valid video IDs
+            skipped += 1
+            continue
+        items.append(TakeoutWatchHistoryItem(entry, video_id=video_id))
+    return items, skipped
+
 
 class TakeoutWatchHistoryItem:
     """Represents a watch history item from Google Takeout data"""
 
-    def __init__(self, data: Dict):
-        self.raw_data = data
+    __slots__ = ('title', 'title_url', 'subtitles', 'time',
+                 'video_id', 'video_url', 'channel_title', 'timestamp',
+                 'description', 'activity_type', 'published_at')
 
+    def __init__(self, data: Dict, video_id: Optional[str] = None):
         # Parse Takeout data structure
         self.title = data.get('title', 'Unknown Title')
         # Remove "Watched " prefix if present
@@ -28,8 +176,8 @@ class TakeoutWatchHistoryItem:
         self.subtitles = data.get('subtitles', [])
         self.time = data.get('time', '')
 
-        # Extract video ID from URL
-        self.video_id = self._extract_video_id(self.title_url)
+        # Extract video ID from URL unless the caller already did
+        self.video_id = video_id or self._extract_video_id(self.title_url)
         self.video_url = f"https://www.youtube.com/watch?v={self.video_id}" if self.video_id else self.title_url
 
         # Extract channel name from subtitles
@@ -43,76 +191,56 @@ class TakeoutWatchHistoryItem:
         self.activity_type = 'watch'
         self.published_at = self.time
 
-    def _extract_video_id(self, url: str) -> Optional[str]:
+    @staticmethod
+    def _extract_video_id(url: str) -> Optional[str]:
         """Extract YouTube video ID from URL"""
         if not url:
             return None
 
-        # Handle different YouTube URL formats
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/v/([a-zA-Z0-9_-]{11})'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-
-        # Try parsing query parameters
-        try:
-            parsed_url = urlparse(url)
-            if 'v' in parse_qs(parsed_url.query):
-                return parse_qs(parsed_url.query)['v'][0]
-        except:
-            pass
+        # Fast path: nearly every Takeout URL is .../watch?v=<11 chars>, so
+        # slice the ID out directly and only fall back to the regex for
+        # exotic URL forms
+        idx = url.find('watch?v=')
+        if idx >= 0:
+            video_id = url[idx + 8:idx + 19]
+            if len(video_id) == 11 and video_id.replace('-', '').replace('_', '').isalnum():
+                return video_id
+
+        # Handle different YouTube URL formats in one pass
+        match = _VIDEO_ID_RE.search(url)
+        if match:
+            return match.group(1)
+
+        # Rare fallback for odd URLs: scan the query string manually, which
+        # skips the dict/list allocations of urlparse + parse_qs
+        if '?' in url and '=' in url:
+            for pair in url.split('?', 1)[1].split('&'):
+                if pair.startswith('v='):
+                    return pair[2:13] or None
 
         return None
 
     def _extract_channel_name(self) -> str:
         """Extract channel name from subtitles"""
-        for subtitle in self.subtitles:
-            if isinstance(subtitle, dict):
-                name = subtitle.get('name', '')
+        # The channel is always the first subtitle in Takeout data, so test
+        # it directly with exact type checks (C-level pointer compares)
+        # instead of looping isinstance over the list
+        subtitles = self.subtitles
+        if subtitles:
+            first = subtitles[0]
+            if type(first) is dict:
+                name = first.get('name')
                 if name:
-                    return name
-            elif isinstance(subtitle, str):
-                return subtitle
+                    return _CHANNEL_INTERN.setdefault(name, name)
+            elif type(first) is str:
+                return _CHANNEL_INTERN.setdefault(first, first)
         return 'Unknown Channel'
 
     def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
         """Parse Google Takeout timestamp"""
         if not timestamp_str:
             return None
-        try:
-            # Google Takeout format: "Dec 15, 2023, 3:45:23 PM PST"
-            # Remove timezone info for basic parsing
-            clean_time = re.sub(r'\s+[A-Z]{3,4}$', '', timestamp_str)
-
-            # Try different formats
-            formats = [
-                "%b %d, %Y, %I:%M:%S %p",  # Dec 15, 2023, 3:45:23 PM
-                "%b %d, %Y, %H:%M:%S",  # Dec 15, 2023, 15:45:23
-                "%Y-%m-%d %H:%M:%S",  # 2023-12-15 15:45:23
-                "%Y-%m-%dT%H:%M:%S",  # 2023-12-15T15:45:23
-            ]
-
-            for fmt in formats:
-                try:
-                    return datetime.strptime(clean_time, fmt)
-                except ValueError:
-                    continue
-
-            # If all else fails, try parsing just the date
-            date_match = re.search(r'(\w{3}\s+\d{1,2},\s+\d{4})', timestamp_str)
-            if date_match:
-                return datetime.strptime(date_match.group(1), "%b %d, %Y")
-
-        except Exception as e:
-            print(f"Warning: Could not parse timestamp '{timestamp_str}': {e}")
-
-        return None
+        return _parse_timestamp_cached(timestamp_str)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for export/serialization"""
@@ -140,6 +268,39 @@ class TakeoutProcessor:
 
     def __init__(self):
         self._cache = []
+        # Column views of the cached history: the summary operations
+        # (top channels, date range) are column reductions, and scanning a
+        # compact list beats walking an attribute per fat object
+        self._channels = []
+        self._timestamps = []
+        self._search_blobs = []
+
+    @staticmethod
+    def _search_blob(item: TakeoutWatchHistoryItem) -> bytes:
+        """Searchable fields lowercased once and packed into compact bytes"""
+        return (item.title + '\0' + item.channel_title).lower().encode('utf-8')
+
+    @staticmethod
+    def _iter_entries(file_path: Path):
+        """
+        Iterate over the top-level entries of a Takeout JSON file
+
+        Uses ijson when available so entries stream from disk one at a time
+        instead of materializing the whole parse tree (watch-history.json is
+        routinely hundreds of MB); falls back to json.load otherwise.
+        Still-compressed Takeout downloads (.json.gz) are read through gzip
+        transparently.
+        """
+        opener = gzip.open if file_path.suffix == '.gz' else open
+        if ijson is not None:
+            with opener(file_path, 'rb') as f:
+                yield from ijson.items(f, 'item', use_float=True)
+        elif orjson is not None:
+            with opener(file_path, 'rb') as f:
+                yield from orjson.loads(f.read())
+        else:
+            with opener(file_path, 'rt', encoding='utf-8') as f:
+                yield from json.load(f)
 
     def load_watch_history(self, file_path: Union[str, Path]) -> List[TakeoutWatchHistoryItem]:
         """
@@ -158,53 +319,84 @@ class TakeoutProcessor:
 
         print(f"📂 Loading watch history from {file_path}")
 
+        executor = None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            print(f"📥 Loaded {len(data)} raw entries from Takeout")
-
-            # Process each entry
+            # Stream entries off disk, batching survivors of the cheap raw
+            # checks into chunks; large histories parse the chunks across
+            # worker processes since item construction is pure CPU
             history_items = []
             skipped = 0
+            total = 0
+            chunk = []
+            futures = []
+
+            for entry in self._iter_entries(file_path):
+                total += 1
+
+                # Skip non-dict elements so one malformed entry can't abort
+                # the whole load
+                if not isinstance(entry, dict):
+                    logger.warning("Skipping malformed Takeout entry: %.120r", entry)
+                    skipped += 1
+                    continue
 
-            for entry in data:
-                try:
-                    # Skip entries without titles or URLs
-                    if not entry.get('title') or not entry.get('titleUrl'):
-                        skipped += 1
-                        continue
-
-                    # Skip non-video entries (like searches, etc.)
-                    if 'youtube.com/watch' not in entry.get('titleUrl', ''):
-                        skipped += 1
-                        continue
-
-                    item = TakeoutWatchHistoryItem(entry)
-                    if item.video_id:  # Only include items with valid video IDs
-                        history_items.append(item)
-                    else:
-                        skipped += 1
-
-                except Exception as e:
-                    print(f"⚠️  Warning: Could not parse entry: {e}")
+                # Skip entries without titles or URLs
+                if not entry.get('title') or not entry.get('titleUrl'):
                     skipped += 1
                     continue
 
+                # Skip non-video entries (like searches, etc.)
+                if 'youtube.com/watch' not in entry['titleUrl']:
+                    skipped += 1
+                    continue
+
+                chunk.append(entry)
+                if len(chunk) >= _PARSE_CHUNK_SIZE:
+                    if executor is None:
+                        executor = ProcessPoolExecutor()
+                    futures.append(executor.submit(_parse_entry_chunk, chunk))
+                    chunk = []
+
+            if futures:
+                if chunk:
+                    futures.append(executor.submit(_parse_entry_chunk, chunk))
+                for future in futures:
+                    items, chunk_skipped = future.result()
+                    history_items.extend(items)
+                    skipped += chunk_skipped
+            else:
+                # Small history: not worth spinning up worker processes
+                history_items, chunk_skipped = _parse_entry_chunk(chunk)
+                skipped += chunk_skipped
+
+            print(f"📥 Read {total} raw entries from Takeout")
             print(f"✅ Processed {len(history_items)} valid watch history items")
             if skipped > 0:
                 print(f"⚠️  Skipped {skipped} invalid/non-video entries")
 
-            # Sort by timestamp (newest first)
-            history_items.sort(key=lambda x: x.timestamp or datetime.min, reverse=True)
+            # Sort by timestamp (newest first, undated items last): decorate
+            # with plain-int keys once so the N log N comparisons are C-level
+            # tuple compares instead of lambda calls on datetime objects
+            keyed = [
+                (-_timestamp_sort_key(item.timestamp) if item.timestamp else 0, i, item)
+                for i, item in enumerate(history_items)
+            ]
+            keyed.sort()
+            history_items = [item for _, _, item in keyed]
 
             self._cache = history_items
+            self._channels = [item.channel_title for item in history_items]
+            self._timestamps = [item.timestamp for item in history_items]
+            self._search_blobs = [self._search_blob(item) for item in history_items]
             return history_items
 
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in takeout file: {e}")
         except Exception as e:
             raise RuntimeError(f"Error processing takeout file: {e}")
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
     def search_history(self, query: str, history: Optional[List[TakeoutWatchHistoryItem]] = None) -> List[
         TakeoutWatchHistoryItem]:
@@ -216,38 +408,36 @@ class TakeoutProcessor:
             print("⚠️  No Takeout history data to search. Try loading a file first.")
             return []
 
-        query_lower = query.lower()
-        matching_items = []
-
-        for item in history:
-            if (query_lower in item.title.lower() or
-                    query_lower in item.channel_title.lower()):
-                matching_items.append(item)
-
-        return matching_items
+        blobs = (self._search_blobs if history is self._cache
+                 else [self._search_blob(item) for item in history])
+        needle = query.lower().encode('utf-8')
+        return [item for blob, item in zip(blobs, history) if needle in blob]
 
     def get_date_range(self, history: List[TakeoutWatchHistoryItem]) -> tuple:
         """Get the date range of watch history"""
-        timestamps = [item.timestamp for item in history if item.timestamp]
+        column = (self._timestamps if history is self._cache
+                  else [item.timestamp for item in history])
+        timestamps = [t for t in column if t]
         if not timestamps:
             return None, None
         return min(timestamps), max(timestamps)
 
     def get_top_channels(self, history: List[TakeoutWatchHistoryItem], limit: int = 10) -> List[tuple]:
         """Get top watched channels with counts"""
-        channel_counts = {}
-        for item in history:
-            channel = item.channel_title
-            channel_counts[channel] = channel_counts.get(channel, 0) + 1
-
-        return sorted(channel_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+        channels = (self._channels if history is self._cache
+                    else [item.channel_title for item in history])
+        return Counter(channels).most_common(limit)
 
     def export_to_json(self, history: List[TakeoutWatchHistoryItem], filename: str = "takeout_watch_history.json"):
         """Export Takeout history to JSON file"""
         try:
             data = [item.to_dict() for item in history]
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             print(f"💾 Exported {len(history)} items to {filename}")
         except Exception as e:
             print(f"❌ Error exporting to JSON: {e}")
@@ -293,18 +483,9 @@ def find_takeout_files(directory: Union[str, Path] = ".") -> List[Path]:
     """
     directory = Path(directory)
 
-    # Common patterns for Takeout watch history files
-    patterns = [
-        "**/watch-history.json",
-        "**/Watch History.json",
-        "**/Takeout/YouTube*/history/watch-history.json",
-        "**/YouTube*/watch-history.json",
-        "**/*watch*history*.json"
-    ]
-
-    found_files = []
-    for pattern in patterns:
-        found_files.extend(directory.glob(pattern))
-
-    # Remove duplicates and return
-    return list(set(found_files))
\ No newline at end of file
+    # One filesystem walk instead of a glob pass per filename pattern; every
+    # Takeout layout names the file with 'watch' and 'history' in some casing
+    return [
+        path for path in directory.rglob('*.json')
+        if 'watch' in path.name.lower() and 'history' in path.name.lower()
+    ]
\ No newline at end of file